@@ -5,134 +5,896 @@
 #                 Sneha Gupta, EC 5TH SEM LNCT&S 
 #                  enrollment no: 0157EC231037
 
+import csv
+import functools
+import io
+import json
+import os
+import sys
+import threading
+import time
+from bisect import bisect_right
+from datetime import date, datetime
+
+
+def parse_date(text):
+    """Parse a DD-MM-YYYY date string, returning None if it is not valid"""
+    if isinstance(text, date):
+        return text
+    try:
+        return datetime.strptime(text.strip(), "%d-%m-%Y").date()
+    except (AttributeError, ValueError):
+        return None
+
+
+def format_date(day):
+    return day.strftime("%d-%m-%Y")
+
+
+class OpStats:
+    """Call count, latency histogram and charge total for one operation
+
+    buckets[k] counts calls that took less than 2**k microseconds (and
+    at least 2**(k-1)); the last bucket also holds anything slower.
+    """
+
+    __slots__ = ("count", "total", "max", "charges", "buckets")
+
+    BUCKETS = 32
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.charges = 0
+        self.buckets = [0] * self.BUCKETS
+
+    def add(self, elapsed, charge=0):
+        self.count += 1
+        self.total += elapsed
+        if elapsed > self.max:
+            self.max = elapsed
+        self.charges += charge
+        self.buckets[min(int(elapsed * 1e6).bit_length(), self.BUCKETS - 1)] += 1
+
+    def percentile(self, pct):
+        """Upper bound in seconds of the bucket holding the pct-th percentile"""
+        if not self.count:
+            return 0.0
+        rank = self.count * pct / 100
+        seen = 0
+        for k, n in enumerate(self.buckets):
+            seen += n
+            if seen >= rank:
+                return min(2 ** k / 1e6, self.max)
+        return self.max
+
+    def snapshot(self):
+        return {"count": self.count, "total": self.total,
+                "mean": self.total / self.count if self.count else 0.0,
+                "p50": self.percentile(50), "p95": self.percentile(95),
+                "p99": self.percentile(99), "max": self.max,
+                "charges": self.charges, "buckets": list(self.buckets)}
+
+
+class Profiler:
+    """Per-operation timers and counters for the hotel flow
+
+    Operations are wrapped with the profiled() decorator. When enabled
+    is False a wrapped call costs one attribute check on top of the call
+    itself. Set HOTEL_PROFILE=0 to start with profiling off, and
+    HOTEL_METRICS_FILE (with HOTEL_METRICS_INTERVAL seconds, default 60)
+    to have a JSON snapshot written periodically.
+    """
+
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        self.stats = {}
+        self.clock = time.perf_counter
+        self.metrics_thread = None
+        self.metrics_stop = threading.Event()
+
+    def record(self, name, elapsed, charge=0):
+        stats = self.stats.get(name)
+        if stats is None:
+            stats = self.stats[name] = OpStats()
+        stats.add(elapsed, charge)
+
+    def start(self):
+        """Return a start time for stop(), or None when profiling is off"""
+        return self.clock() if self.enabled else None
+
+    def stop(self, name, started, charge=0):
+        if started is not None:
+            self.record(name, self.clock() - started, charge)
+
+    def profiled(self, name, charges=False):
+        """Decorator timing every call of a function under name
+
+        With charges=True a numeric return value is added to the
+        operation's charge total. Calls that raise are timed too, with
+        no charge.
+        """
+        def decorate(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                started = self.clock()
+                result = None
+                try:
+                    result = func(*args, **kwargs)
+                    return result
+                finally:
+                    charge = result if charges and isinstance(result, (int, float)) else 0
+                    self.record(name, self.clock() - started, charge)
+            return wrapper
+        return decorate
+
+    def reset(self):
+        self.stats = {}
+
+    def snapshot(self):
+        """Return a dict of every operation's statistics"""
+        return {name: stats.snapshot() for name, stats in list(self.stats.items())}
+
+    def dump(self, stream=None):
+        """Print a table of per-operation latency and charges"""
+        stream = stream if stream is not None else sys.stdout
+        stream.write("******PERFORMANCE REPORT******\n")
+        stream.write("%-20s %7s %10s %10s %10s %10s %10s %10s\n" % (
+            "operation", "count", "mean ms", "p50 ms", "p95 ms", "p99 ms", "max ms", "charges"))
+        for name, op in sorted(self.snapshot().items()):
+            stream.write("%-20s %7d %10.3f %10.3f %10.3f %10.3f %10.3f %10d\n" % (
+                name, op["count"], op["mean"] * 1e3, op["p50"] * 1e3, op["p95"] * 1e3,
+                op["p99"] * 1e3, op["max"] * 1e3, op["charges"]))
+        stream.write("\n")
+
+    def write_metrics(self, filename):
+        """Write a JSON snapshot to filename, replacing it atomically"""
+        with open(filename + ".tmp", "w") as file:
+            json.dump({"time": time.time(), "operations": self.snapshot()}, file, indent=4)
+        os.replace(filename + ".tmp", filename)
+
+    def start_metrics_file(self, filename, interval=60):
+        """Write a metrics snapshot every interval seconds from a background thread"""
+        self.stop_metrics_file()
+        self.metrics_stop.clear()
+
+        def run():
+            while not self.metrics_stop.wait(interval):
+                try:
+                    self.write_metrics(filename)
+                except OSError as e:
+                    print("Error writing metrics file:", e)
+
+        self.metrics_thread = threading.Thread(target=run, daemon=True)
+        self.metrics_thread.start()
+
+    def stop_metrics_file(self):
+        if self.metrics_thread is not None:
+            self.metrics_stop.set()
+            self.metrics_thread.join()
+            self.metrics_thread = None
+
+
+PROFILER = Profiler(enabled=os.environ.get("HOTEL_PROFILE", "1") != "0")
+
+if os.environ.get("HOTEL_METRICS_FILE"):
+    PROFILER.start_metrics_file(os.environ["HOTEL_METRICS_FILE"],
+                                float(os.environ.get("HOTEL_METRICS_INTERVAL", 60)))
+
+
+# room class choice -> (class name, rate per night)
+ROOM_RATES = {1: ("A", 4000), 2: ("B", 3000), 3: ("C", 2000), 4: ("D", 1000)}
+
+# restaurant menu choice -> (item, price)
+FOOD_PRICES = {1: ("Dessert", 100), 2: ("Drinks", 50), 3: ("Breakfast", 90),
+               4: ("Lunch", 110), 5: ("Dinner", 150)}
+
+# room class choice -> room numbers of that class
+ROOM_INVENTORY = {1: range(101, 111), 2: range(201, 221),
+                  3: range(301, 331), 4: range(401, 441)}
+
+
+class OccupancyReport:
+    """Hotel-wide per-day occupancy and revenue figures
+
+    Room-nights sold, room revenue and food revenue are kept in per-day
+    arrays starting at the earliest day seen. Each array has a matching
+    prefix-sum array so any date range is answered with two lookups.
+    Billing a stay only marks the prefix sums dirty from its first day;
+    they are brought up to date from that day on the next query.
+    total_rooms defaults to the size of ROOM_INVENTORY.
+    """
+
+    def __init__(self, total_rooms=None):
+        if total_rooms is None:
+            total_rooms = sum(len(rooms) for rooms in ROOM_INVENTORY.values())
+        self.total_rooms = total_rooms
+        self.start = None           # ordinal of day index 0
+        self.nights = []
+        self.room_revenue = []
+        self.food_revenue = []
+        self.nights_sum = [0]       # prefix sums, one longer than the arrays
+        self.room_sum = [0]
+        self.food_sum = [0]
+        self.dirty = None           # first day index whose prefix sum is stale
+
+    def _index(self, day):
+        """Return the array index for a day, growing the arrays as needed"""
+        o = day.toordinal()
+        if self.start is None:
+            self.start = o
+        if o < self.start:
+            pad = [0] * (self.start - o)
+            self.nights = pad + self.nights
+            self.room_revenue = pad + self.room_revenue
+            self.food_revenue = pad + self.food_revenue
+            self.start = o
+            self.dirty = 0
+        i = o - self.start
+        if i >= len(self.nights):
+            pad = [0] * (i + 1 - len(self.nights))
+            self.nights.extend(pad)
+            self.room_revenue.extend(pad)
+            self.food_revenue.extend(pad)
+        return i
+
+    def _mark(self, i):
+        if self.dirty is None or i < self.dirty:
+            self.dirty = i
+
+    def record_stay(self, checkin, nights, room_rent, food=0):
+        """Add a billed stay: rent is spread over the nights, food goes on the last night"""
+        if nights <= 0:
+            return
+        first = self._index(checkin)
+        last = self._index(date.fromordinal(checkin.toordinal() + nights - 1))
+        first = last - nights + 1   # index may have shifted if the arrays grew at the front
+        per_night = room_rent / nights
+        for i in range(first, last + 1):
+            self.nights[i] += 1
+            self.room_revenue[i] += per_night
+        self.food_revenue[last] += food
+        self._mark(first)
+
+    def _refresh(self):
+        """Recompute the prefix sums from the first stale day onwards"""
+        if self.dirty is None:
+            return
+        i = self.dirty
+        del self.nights_sum[i + 1:]
+        del self.room_sum[i + 1:]
+        del self.food_sum[i + 1:]
+        for j in range(i, len(self.nights)):
+            self.nights_sum.append(self.nights_sum[j] + self.nights[j])
+            self.room_sum.append(self.room_sum[j] + self.room_revenue[j])
+            self.food_sum.append(self.food_sum[j] + self.food_revenue[j])
+        self.dirty = None
+
+    def _range(self, first, last):
+        """Clamp an inclusive date range to array indexes, returning (lo, hi, days)"""
+        days = last.toordinal() - first.toordinal() + 1
+        if days <= 0:
+            raise ValueError("end date is before start date")
+        if self.start is None:
+            return 0, 0, days
+        n = len(self.nights)
+        lo = min(max(first.toordinal() - self.start, 0), n)
+        hi = min(max(last.toordinal() - self.start + 1, 0), n)
+        return lo, hi, days
+
+    def totals(self, first, last):
+        """Return (room nights sold, room revenue, food revenue, days) for first..last inclusive"""
+        self._refresh()
+        lo, hi, days = self._range(first, last)
+        return (self.nights_sum[hi] - self.nights_sum[lo],
+                self.room_sum[hi] - self.room_sum[lo],
+                self.food_sum[hi] - self.food_sum[lo],
+                days)
+
+    def occupancy(self, first, last):
+        """Percentage of available room-nights that were sold"""
+        sold, _, _, days = self.totals(first, last)
+        return 100 * sold / (self.total_rooms * days)
+
+    def adr(self, first, last):
+        """Average daily rate: room revenue per room-night sold"""
+        sold, rent, _, _ = self.totals(first, last)
+        return rent / sold if sold else 0
+
+    def revpar(self, first, last):
+        """Room revenue per available room-night"""
+        _, rent, _, days = self.totals(first, last)
+        return rent / (self.total_rooms * days)
+
+    def display(self, first, last):
+        sold, rent, food, days = self.totals(first, last)
+        print ("******OCCUPANCY REPORT******")
+        print ("Period:", format_date(first), "to", format_date(last))
+        print ("Room nights sold:", sold)
+        print ("Occupancy: %.1f%%" % self.occupancy(first, last))
+        print ("Room revenue:", round(rent, 2))
+        print ("Food revenue:", round(food, 2))
+        print ("ADR:", round(self.adr(first, last), 2))
+        print ("RevPAR:", round(self.revpar(first, last), 2), "\n")
+
+
+class Folio:
+    """Charges for one guest's stay in one room
+
+    fno is the folio number, unique per stay; the same room can hold
+    several folios for different dates. cindate and coutdate are
+    datetime.date objects; the number of nights is always derived from
+    them.
+    """
+
+    __slots__ = ("fno", "rno", "name", "address", "cindate", "coutdate",
+                 "room_class", "rent", "food", "misc")
+
+    def __init__(self, fno, rno, name, address, cindate, coutdate):
+        self.fno = fno
+        self.rno = rno
+        self.name = name
+        self.address = address
+        self.cindate = cindate
+        self.coutdate = coutdate
+        self.room_class = ""
+        self.rent = 0
+        self.food = 0
+        self.misc = 0
+
+    @property
+    def nights(self):
+        return (self.coutdate - self.cindate).days
+
+    def subtotal(self):
+        return self.rent + self.food + self.misc
+
+    def __repr__(self):
+        return f"Folio(no={self.fno}, room={self.rno}, name={self.name!r}, subtotal={self.subtotal()})"
+
+
+class HotelManager:
+    """Hotel-wide state: open folios, room bookings and the service charge
+
+    Folios are held in a dict keyed by folio number. Rooms come from the
+    inventory (room class choice -> room numbers), and rooms maps each
+    room number to the folios booked in it, so a room can be booked for
+    back-to-back stays and only overlapping dates are refused. Guest
+    names, arrival dates and departure dates are indexed the same way,
+    so all these lookups are O(1). Folios checked out since the last
+    close_day() are kept in closed for invoicing.
+    """
+
+    def __init__(self, service_charge=1000, report=None, inventory=ROOM_INVENTORY):
+        self.service_charge = service_charge
+        self.inventory = inventory
+        self.room_classes = {rno: choice for choice, rooms in inventory.items() for rno in rooms}
+        if report is None:
+            report = OccupancyReport(sum(len(rooms) for rooms in inventory.values()))
+        self.report = report
+        self.next_folio = 1
+        self.folios = {}
+        self.rooms = {}
+        self.by_name = {}
+        self.by_arrival = {}
+        self.by_departure = {}
+        self.closed = []
+
+    def __len__(self):
+        return len(self.folios)
+
+    def _gap(self, rno, cin, cout):
+        """Return the idle days left before a stay in a room, or None if it overlaps a booking"""
+        gap = cin.toordinal()
+        for fno in self.rooms.get(rno, ()):
+            folio = self.folios[fno]
+            if folio.cindate < cout and cin < folio.coutdate:
+                return None
+            if folio.coutdate <= cin:
+                gap = min(gap, (cin - folio.coutdate).days)
+        return gap
+
+    def free_room(self, choice, cindate, coutdate):
+        """Return a room of a class free for the dates, or None
+
+        Like RoomAllocator, the room whose previous stay ended closest
+        before the check in date is preferred.
+        """
+        best = None
+        for rno in self.inventory.get(choice, ()):
+            gap = self._gap(rno, cindate, coutdate)
+            if gap is not None and (best is None or gap < best[0]):
+                best = (gap, rno)
+        return best[1] if best is not None else None
+
+    def bookings(self):
+        """Return {room no.: [(cindate, coutdate), ...]} for the open folios"""
+        return {rno: [(self.folios[fno].cindate, self.folios[fno].coutdate) for fno in fnos]
+                for rno, fnos in self.rooms.items()}
+
+    def allocate(self, reservations):
+        """Assign rooms to reservations around the current bookings, see RoomAllocator"""
+        return RoomAllocator(self.inventory).allocate(reservations, self.bookings())
+
+    @PROFILER.profiled("manager.check_in")
+    def check_in(self, name, address, cindate, coutdate, choice=None, rno=None):
+        """Open a folio for a new guest and charge the room
+
+        The guest gets room rno (for example one chosen by allocate()),
+        or a free room of class choice from the inventory. Dates may be
+        datetime.date objects or DD-MM-YYYY strings.
+        """
+        cin = parse_date(cindate)
+        cout = parse_date(coutdate)
+        if cin is None or cout is None:
+            raise ValueError("Dates should be in DD-MM-YYYY format")
+        if cout <= cin:
+            raise ValueError("Check out date should be after check in date")
+        if rno is not None:
+            if rno not in self.room_classes:
+                raise ValueError("Room no. %s does not exist" % rno)
+            if self._gap(rno, cin, cout) is None:
+                raise ValueError("Room no. %d is already booked for these dates" % rno)
+        elif choice in ROOM_RATES:
+            rno = self.free_room(choice, cin, cout)
+            if rno is None:
+                raise ValueError("No Class %s room is free for these dates" % ROOM_RATES[choice][0])
+        else:
+            raise ValueError("please choose a room")
+
+        folio = Folio(self.next_folio, rno, name, address, cin, cout)
+        self.next_folio += 1
+        self.folios[folio.fno] = folio
+        self.rooms.setdefault(rno, set()).add(folio.fno)
+        self.by_name.setdefault(name.strip().lower(), set()).add(folio.fno)
+        self.by_arrival.setdefault(cin, set()).add(folio.fno)
+        self.by_departure.setdefault(cout, set()).add(folio.fno)
+        self._charge_room(folio)
+        return folio
+
+    def _charge_room(self, folio):
+        folio.room_class, rate = ROOM_RATES[self.room_classes[folio.rno]]
+        folio.rent = rate * folio.nights
+
+    def get(self, fno):
+        """Return an open folio by folio number, raising KeyError if there is none"""
+        return self.folios[fno]
+
+    def in_room(self, rno, day=None):
+        """Return the open folios booked in a room, or the one staying there on day"""
+        folios = sorted((self.folios[fno] for fno in self.rooms.get(rno, ())),
+                        key=lambda folio: folio.cindate)
+        if day is not None:
+            day = parse_date(day)
+            folios = [folio for folio in folios if folio.cindate <= day < folio.coutdate]
+        return folios
+
+    def _lookup(self, index, key):
+        return [self.folios[fno] for fno in sorted(index.get(key, ()))]
+
+    def find(self, name):
+        """Return the open folios booked under a guest name"""
+        return self._lookup(self.by_name, name.strip().lower())
+
+    def arrivals(self, day):
+        """Return the open folios checking in on a day"""
+        return self._lookup(self.by_arrival, parse_date(day))
+
+    def departures(self, day):
+        """Return the open folios checking out on a day"""
+        return self._lookup(self.by_departure, parse_date(day))
+
+    @PROFILER.profiled("manager.set_room")
+    def set_room(self, fno, choice):
+        """Move a folio to a room of class choice if needed and charge it for every night"""
+        if choice not in ROOM_RATES:
+            raise ValueError("please choose a room")
+        folio = self.folios[fno]
+        if self.room_classes[folio.rno] != choice:
+            rno = self.free_room(choice, folio.cindate, folio.coutdate)
+            if rno is None:
+                raise ValueError("No Class %s room is free for these dates" % ROOM_RATES[choice][0])
+            self._unindex(self.rooms, folio.rno, fno)
+            folio.rno = rno
+            self.rooms.setdefault(rno, set()).add(fno)
+        self._charge_room(folio)
+        return folio.rent
+
+    @PROFILER.profiled("manager.add_food")
+    def add_food(self, fno, choice, quantity):
+        """Add a restaurant order from FOOD_PRICES to a folio"""
+        if choice not in FOOD_PRICES:
+            raise ValueError("You've Enter an Invalid Key")
+        folio = self.folios[fno]
+        folio.food += FOOD_PRICES[choice][1] * quantity
+        return folio.food
+
+    def total(self, fno):
+        return self.folios[fno].subtotal() + self.service_charge
+
+    @PROFILER.profiled("manager.check_out")
+    def check_out(self, fno):
+        """Close a folio and record the stay in the occupancy report"""
+        folio = self.folios.pop(fno)
+        self._unindex(self.rooms, folio.rno, fno)
+        self._unindex(self.by_name, folio.name.strip().lower(), fno)
+        self._unindex(self.by_arrival, folio.cindate, fno)
+        self._unindex(self.by_departure, folio.coutdate, fno)
+        self.report.record_stay(folio.cindate, folio.nights, folio.rent, folio.food)
+        self.closed.append(folio)
+        return folio
+
+    def day_folios(self):
+        """Return the folios closed today followed by the ones still open"""
+        return self.closed + list(self.folios.values())
+
+    def close_day(self):
+        """Start a new day, returning the folios closed during the old one"""
+        closed, self.closed = self.closed, []
+        return closed
+
+    @staticmethod
+    def _unindex(index, key, fno):
+        fnos = index[key]
+        fnos.discard(fno)
+        if not fnos:
+            del index[key]
+
+
+INVOICE_TEMPLATE = """******HOTEL BILL******
+Customer details:
+Customer name: {name}
+Customer address: {address}
+Check in date: {cindate}
+Check out date {coutdate}
+Room no. {rno}
+Your Room rent is: {rent}
+Your Food bill is: {food}
+Your sub total Purchased is: {subtotal}
+Additional Service Charges is {service_charge}
+Your grandtotal Purchased is: {total}
+
+"""
+
+CSV_FIELDS = ["room_no", "guest", "item", "quantity", "rate", "amount"]
+
+
+class RoomAllocator:
+    """Assign concrete rooms to a batch of reservations
+
+    Each reservation keeps one room for its whole stay. Per room class,
+    reservations are taken in order of check out date and each goes to
+    the free room whose previous stay ended closest before its check in
+    date (a room with no earlier stay comes last, lowest number first).
+    This best-fit greedy leaves the fewest gaps between stays, and with
+    no existing bookings it assigns the largest possible number of
+    reservations.
+    """
+
+    def __init__(self, inventory=ROOM_INVENTORY):
+        self.inventory = inventory
+
+    @staticmethod
+    def room_choice(room_class):
+        """Return the ROOM_RATES choice for a choice number or class letter"""
+        if room_class in ROOM_RATES:
+            return room_class
+        for choice, (cls, _) in ROOM_RATES.items():
+            if str(room_class).strip().upper() == cls:
+                return choice
+        return None
+
+    @PROFILER.profiled("allocator.allocate")
+    def allocate(self, reservations, bookings=None):
+        """Assign rooms to (room class, cindate, coutdate) reservations
+
+        bookings maps room numbers to (cindate, coutdate) stays already
+        booked, such as HotelManager.bookings(); reservations are fitted
+        around them. Returns (rooms, unassigned): rooms[i] is the room
+        number given to reservations[i] or None, and unassigned lists
+        (i, reason) pairs.
+        """
+        rooms = [None] * len(reservations)
+        unassigned = []
+        by_class = {}
+        for i, (room_class, cindate, coutdate) in enumerate(reservations):
+            choice = self.room_choice(room_class)
+            cin = parse_date(cindate)
+            cout = parse_date(coutdate)
+            if choice is None or choice not in self.inventory:
+                unassigned.append((i, "unknown room class"))
+            elif cin is None or cout is None or cout <= cin:
+                unassigned.append((i, "invalid dates"))
+            else:
+                by_class.setdefault(choice, []).append((cout.toordinal(), cin.toordinal(), i))
+
+        # per room, sorted check in ordinals and the matching check outs
+        starts = {}
+        ends = {}
+        for rno, stays in (bookings or {}).items():
+            stays = sorted((parse_date(a).toordinal(), parse_date(b).toordinal()) for a, b in stays)
+            starts[rno] = [a for a, _ in stays]
+            ends[rno] = [b for _, b in stays]
+
+        for choice, stays in by_class.items():
+            stays.sort()
+            class_rooms = list(self.inventory[choice])
+            for cout, cin, i in stays:
+                best = None
+                for rno in class_rooms:
+                    room_starts = starts.get(rno, ())
+                    k = bisect_right(room_starts, cin)
+                    if k and ends[rno][k - 1] > cin:
+                        continue    # previous stay still in the room
+                    if k < len(room_starts) and room_starts[k] < cout:
+                        continue    # next stay arrives before we leave
+                    gap = cin - ends[rno][k - 1] if k else float("inf")
+                    if best is None or gap < best[0]:
+                        best = (gap, k, rno)
+                        if gap == 0:
+                            break
+                if best is None:
+                    unassigned.append((i, "no room available"))
+                    continue
+                _, k, rno = best
+                starts.setdefault(rno, []).insert(k, cin)
+                ends.setdefault(rno, []).insert(k, cout)
+                rooms[i] = rno
+
+        unassigned.sort()
+        return rooms, unassigned
+
+
+class InvoiceRenderer:
+    """Render folios as text invoices or CSV line items
+
+    Invoices are rendered into an in-memory buffer and written out in
+    batches of batch_size folios, so a whole day's invoices go to disk
+    in a handful of large writes.
+    """
+
+    def __init__(self, service_charge=1000, template=INVOICE_TEMPLATE, batch_size=500):
+        self.service_charge = service_charge
+        self.template = template
+        self.batch_size = batch_size
+
+    def render_text(self, folio):
+        """Return the text invoice for one folio"""
+        subtotal = folio.subtotal()
+        return self.template.format(
+            name=folio.name, address=folio.address,
+            cindate=format_date(folio.cindate), coutdate=format_date(folio.coutdate),
+            rno=folio.rno, rent=folio.rent, food=folio.food,
+            subtotal=subtotal, service_charge=self.service_charge,
+            total=subtotal + self.service_charge)
+
+    def line_items(self, folio):
+        """Return the CSV rows for one folio"""
+        rows = []
+        if folio.rent:
+            rate = folio.rent // folio.nights if folio.nights else folio.rent
+            rows.append([folio.rno, folio.name, "Room Class " + folio.room_class,
+                         folio.nights, rate, folio.rent])
+        if folio.food:
+            rows.append([folio.rno, folio.name, "Food", 1, folio.food, folio.food])
+        if folio.misc:
+            rows.append([folio.rno, folio.name, "Other", 1, folio.misc, folio.misc])
+        rows.append([folio.rno, folio.name, "Service Charge", 1,
+                     self.service_charge, self.service_charge])
+        return rows
+
+    def write_text(self, folios, stream):
+        """Write the text invoices for all folios to one stream"""
+        batch = []
+        for folio in folios:
+            batch.append(self.render_text(folio))
+            if len(batch) >= self.batch_size:
+                stream.write("".join(batch))
+                batch = []
+        if batch:
+            stream.write("".join(batch))
+
+    def write_csv(self, folios, stream, header=True):
+        """Write the line items for all folios to one CSV stream"""
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, lineterminator="\n")
+        if header:
+            writer.writerow(CSV_FIELDS)
+        for i, folio in enumerate(folios, 1):
+            writer.writerows(self.line_items(folio))
+            if i % self.batch_size == 0:
+                stream.write(buffer.getvalue())
+                buffer.seek(0)
+                buffer.truncate()
+        stream.write(buffer.getvalue())
+
+    def export(self, folios, directory, per_guest=False):
+        """Write invoices.txt and invoices.csv to a directory
+
+        With per_guest=True each folio gets its own
+        room_<no>_<check in YYYYMMDD>.txt and .csv instead. Returns the list of files written.
+        """
+        os.makedirs(directory, exist_ok=True)
+        paths = []
+        if per_guest:
+            for folio in folios:
+                base = os.path.join(directory, "room_%d_%s" % (folio.rno, folio.cindate.strftime("%Y%m%d")))
+                with open(base + ".txt", "w") as f:
+                    f.write(self.render_text(folio))
+                with open(base + ".csv", "w", newline="") as f:
+                    self.write_csv([folio], f)
+                paths += [base + ".txt", base + ".csv"]
+        else:
+            folios = list(folios)
+            text_path = os.path.join(directory, "invoices.txt")
+            csv_path = os.path.join(directory, "invoices.csv")
+            with open(text_path, "w", buffering=1 << 20) as f:
+                self.write_text(folios, f)
+            with open(csv_path, "w", newline="", buffering=1 << 20) as f:
+                self.write_csv(folios, f)
+            paths += [text_path, csv_path]
+        return paths
+
 
 class hotelmanage:
+    """Menu front end for a HotelManager, working on one selected guest at a time"""
 
-    def __init__(self,rt='',s=0,p=0,r=0,t=0,a=1000,name='',address='',cindate='',coutdate='',rno=1):
+    def __init__(self,manager=None):
 
         print ("\n\n*****WELCOME TO HOTEl DE SUAREZ*****\n")
 
-        self.rt=rt
-        self.r=r
-        self.t=t
-        self.p=p
-        self.s=s
-        self.a=a
-        self.name=name
-        self.address=address
-        self.cindate=cindate
-        self.coutdate=coutdate
-        self.rno=rno
-    def inputdata(self):
-        self.name=input("\nEnter your Fullname:")
-        self.address=input("\nEnter your address:")
-        self.cindate=input("\nEnter your check in date:")
-        self.coutdate=input("\nEnter your checkout date:")
-        print("Your room no.:",self.rno,"\n")
-        
-    def roomrent(self):#sel1353
-
-        print ("We have the following rooms for you:-")
-
-        print ("1.  Class A---->4000")
-
-        print ("2.  Class B---->3000")
-
-        print ("3.  Class C---->2000")
-
-        print ("4.  Class D---->1000")
+        self.manager=manager if manager is not None else HotelManager()
+        self.renderer=InvoiceRenderer(self.manager.service_charge)
+        self.current=None
 
-        x=int(input("Enter the number of your choice Please->"))
-
-        n=int(input("For How Many Nights Did You Stay:"))
-
-        if(x==1):
-
-            print ("you have choose room Class A")
+    def selected(self):
+        if self.current is None:
+            print ("Please enter customer data or select a guest first\n")
+        return self.current
 
-            self.s=4000*n
-
-        elif (x==2):
-
-            print ("you have choose room Class B")
+    def showrooms(self):
+        print ("We have the following rooms for you:-")
 
-            self.s=3000*n
+        for x,(cls,rate) in ROOM_RATES.items():
 
-        elif (x==3):
+            print ("%d.  Class %s---->%d" % (x,cls,rate))
 
-            print ("you have choose room Class C")
+    @PROFILER.profiled("inputdata")
+    def inputdata(self):
+        name=input("\nEnter your Fullname:")
+        address=input("\nEnter your address:")
+        while (1):
+            cindate=input("\nEnter your check in date (DD-MM-YYYY):")
+            coutdate=input("\nEnter your checkout date (DD-MM-YYYY):")
+            self.showrooms()
+            x=int(input("Enter the number of your choice Please->"))
+            try:
+                self.current=self.manager.check_in(name,address,cindate,coutdate,choice=x)
+                break
+            except ValueError as e:
+                print (e)
+        print("Your room no.:",self.current.rno,"\n")
+
+    def selectguest(self):
+        key=input("Enter room no. or guest name:").strip()
+        if key.isdigit():
+            found=self.manager.in_room(int(key))
+        else:
+            found=self.manager.find(key)
+        if not found:
+            print ("No guest found\n")
+            return
+        for i,folio in enumerate(found,1):
+            print ("%d. Room no. %d - %s (%s to %s)" % (i,folio.rno,folio.name,
+                                                      format_date(folio.cindate),format_date(folio.coutdate)))
+        n=1
+        if len(found)>1:
+            n=int(input("Enter the number of the guest:"))
+        if not 1<=n<=len(found):
+            print ("No guest found\n")
+            return
+        self.current=found[n-1]
+        print ("Selected room no.",self.current.rno,"-",self.current.name,"\n")
+
+    @PROFILER.profiled("roomrent",charges=True)
+    def roomrent(self):#sel1353
 
-            self.s=2000*n
+        folio=self.selected()
+        if folio is None:
+            return
 
-        elif (x==4):
-            print ("you have choose room Class D")
+        self.showrooms()
 
-            self.s=1000*n
+        x=int(input("Enter the number of your choice Please->"))
 
-        else:
+        print ("Number of nights:",folio.nights)
 
-            print ("please choose a room")
+        before=folio.rent
+        try:
+            self.manager.set_room(folio.fno,x)
+            print ("you have choose room Class",folio.room_class,"- room no.",folio.rno)
+        except ValueError as e:
+            print (e)
+            print ("your choosen room rent is =",folio.rent,"\n")
+            return 0
 
-        print ("your choosen room rent is =",self.s,"\n")
+        print ("your choosen room rent is =",folio.rent,"\n")
+        return folio.rent-before
 
+    @PROFILER.profiled("foodpurchased",charges=True)
     def foodpurchased(self):
 
+        folio=self.selected()
+        if folio is None:
+            return
+        before=folio.food
+
         print("*****RESTAURANT MENU*****")
 
-        print("1.Dessert----->100","2.Drinks----->50","3.Breakfast--->90","4.Lunch---->110","5.Dinner--->150","6.Exit")
+        print(*["%d.%s----->%d" % (c,item,price) for c,(item,price) in FOOD_PRICES.items()],"6.Exit")
 
 
         while (1):
 
             c=int(input("Enter the number of your choice:"))
 
-
-            if (c==1):
-                d=int(input("Enter the quantity:"))
-                self.r=self.r+100*d
-
-            elif (c==2):
-                 d=int(input("Enter the quantity:"))
-                 self.r=self.r+50*d
-
-            elif (c==3):
-                 d=int(input("Enter the quantity:"))
-                 self.r=self.r+90*d
-
-            elif (c==4):
-                 d=int(input("Enter the quantity:"))
-                 self.r=self.r+110*d
-
-            elif (c==5):
-                 d=int(input("Enter the quantity:"))
-                 self.r=self.r+150*d
-
-            elif (c==6):
+            if (c==6):
                 break;
+            elif c in FOOD_PRICES:
+                d=int(input("Enter the quantity:"))
+                self.manager.add_food(folio.fno,c,d)
             else:
                 print("You've Enter an Invalid Key")
 
-        print ("Total food Cost=Rs",self.r,"\n")
+        print ("Total food Cost=Rs",folio.food,"\n")
+        return folio.food-before
 
 
 
+    @PROFILER.profiled("display",charges=True)
     def display(self):
-        print ("******HOTEL BILL******")
-        print ("Customer details:")
-        print ("Customer name:",self.name)
-        print ("Customer address:",self.address)
-        print ("Check in date:",self.cindate)
-        print ("Check out date",self.coutdate)
-        print ("Room no.",self.rno)
-        print ("Your Room rent is:",self.s)
-        print ("Your Food bill is:",self.r)
-
-        self.rt=self.s+self.t+self.p+self.r
-
-        print ("Your sub total Purchased is:",self.rt)
-        print ("Additional Service Charges is",self.a)
-        print ("Your grandtotal Purchased is:",self.rt+self.a,"\n")
-        self.rno+=1
+        folio=self.selected()
+        if folio is None:
+            return
+        print (self.renderer.render_text(folio),end="")
+
+        total=self.manager.total(folio.fno)
+        self.manager.check_out(folio.fno)
+        self.current=None
+        return total
+
+    def showreport(self):
+        first=parse_date(input("Enter report start date (DD-MM-YYYY):"))
+        last=parse_date(input("Enter report end date (DD-MM-YYYY):"))
+        if first is None or last is None or last<first:
+            print ("Please enter a valid date range\n")
+            return
+        self.manager.report.display(first,last)
+
+    def exportinvoices(self):
+        directory=input("Enter folder to save invoices in:").strip() or "invoices"
+        per_guest=input("One file per guest? (y/n):").strip().lower()=="y"
+        folios=self.manager.day_folios()
+        paths=self.renderer.export(folios,directory,per_guest)
+        print ("Saved",len(folios),"invoices in",len(paths),"files to",directory,"\n")
+        if input("Start a new day? (y/n):").strip().lower()=="y":
+            self.manager.close_day()
+
+    def showmovements(self):
+        day=parse_date(input("Enter date (DD-MM-YYYY):"))
+        if day is None:
+            print ("Please enter a valid date\n")
+            return
+        print ("Arrivals on",format_date(day))
+        for folio in self.manager.arrivals(day):
+            print ("  Room no.",folio.rno,"-",folio.name)
+        print ("Departures on",format_date(day))
+        for folio in self.manager.departures(day):
+            print ("  Room no.",folio.rno,"-",folio.name)
+        print ()
 
             
 
@@ -154,9 +916,20 @@ def main():
 
         print("4.Show total cost")
 
-        print("5.EXIT")
+        print("5.Occupancy Report")
+
+        print("6.Select Guest")
+
+        print("7.Arrivals and Departures")
+
+        print("8.Export Invoices")
+
+        print("9.Performance Report")
+
+        print("10.EXIT")
 
         b=int(input("\nEnter the number of your choice:"))
+        started=PROFILER.start()
         if (b==1):
             a.inputdata()
 
@@ -174,9 +947,34 @@ def main():
 
         if (b==5):
 
+            a.showreport()
+
+        if (b==6):
+
+            a.selectguest()
+
+        if (b==7):
+
+            a.showmovements()
+
+        if (b==8):
+
+            a.exportinvoices()
+
+        if (b==9):
+
+            PROFILER.dump()
+
+        if (b==10):
+
             quit()
 
+        if (1<=b<=9):
+
+            PROFILER.stop("menu.%d" % b,started)
+
 
 
-main()
+if __name__ == "__main__":
+    main()
 
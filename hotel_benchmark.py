@@ -0,0 +1,176 @@
+#                workload simulator and benchmark for the
+#                     hotel management system
+#
+# usage: python hotel_benchmark.py [guests] [seed]
+#
+# The profiler is switched off while the benchmark runs so its overhead
+# is not in the timings, set HOTEL_PROFILE=1 to measure with it on.
+
+import os
+import random
+import sys
+import time
+import tracemalloc
+from datetime import date, timedelta
+
+import Hotel_management_SnehaGupta_0157EC231037 as hotel
+
+# stay length in nights -> relative weight, mostly short stays
+STAY_WEIGHTS = {1: 30, 2: 25, 3: 15, 4: 10, 5: 7, 6: 4, 7: 4, 10: 3, 14: 2}
+
+# room class choice -> relative weight, cheaper rooms sell more
+CLASS_WEIGHTS = {1: 10, 2: 20, 3: 35, 4: 35}
+
+
+class Workload:
+    """Synthetic guests with stay dates, room class and restaurant orders"""
+
+    def __init__(self, guests, seed=1, start=date(2026, 1, 1), days=90):
+        rng = random.Random(seed)
+        stays = list(STAY_WEIGHTS)
+        stay_weights = list(STAY_WEIGHTS.values())
+        classes = list(CLASS_WEIGHTS)
+        class_weights = list(CLASS_WEIGHTS.values())
+        items = list(hotel.FOOD_PRICES)
+        self.guests = []
+        for i in range(guests):
+            cin = start + timedelta(days=rng.randrange(days))
+            nights = rng.choices(stays, stay_weights)[0]
+            orders = [(rng.choice(items), rng.randint(1, 4))
+                      for _ in range(rng.randint(0, 3 * nights))]
+            self.guests.append(("Guest %d" % i, "Address %d" % i, cin,
+                                cin + timedelta(days=nights),
+                                rng.choices(classes, class_weights)[0], orders))
+
+
+def percentile(samples, pct):
+    """Return the pct-th percentile of an already sorted list"""
+    if not samples:
+        return 0
+    return samples[min(len(samples) - 1, int(len(samples) * pct / 100))]
+
+
+class NullSink:
+    """Stream that counts the characters written to it and keeps none"""
+
+    def __init__(self):
+        self.chars = 0
+
+    def write(self, text):
+        self.chars += len(text)
+
+
+def drive(workload, manager, timings=None):
+    """Run the guests through the hotel one day at a time
+
+    Each day the departing guests get their invoice and check out, then
+    the day's arrivals get rooms from the allocator around the guests
+    still in house, check in and order food. Only the guests in house
+    are held at any time. Returns the NullSink the invoices went to.
+    """
+    renderer = hotel.InvoiceRenderer(manager.service_charge)
+    out = NullSink()
+    clock = time.perf_counter
+
+    def timed(name, func, *args):
+        if timings is None:
+            return func(*args)
+        t = clock()
+        result = func(*args)
+        timings[name].append(clock() - t)
+        return result
+
+    def depart(folio):
+        timed("invoice", lambda: out.write(renderer.render_text(folio)))
+        timed("check_out", manager.check_out, folio.fno)
+
+    arrivals = {}
+    for guest in workload.guests:
+        arrivals.setdefault(guest[2], []).append(guest)
+    for day in sorted(arrivals):
+        for folio in sorted(manager.departures(day), key=lambda f: f.fno):
+            depart(folio)
+        manager.close_day()
+        guests = arrivals[day]
+        rooms, unassigned = timed("allocate", manager.allocate,
+                                  [(choice, cin, cout) for _, _, cin, cout, choice, _ in guests])
+        for (name, address, cin, cout, choice, orders), rno in zip(guests, rooms):
+            if rno is None:
+                continue
+            folio = timed("check_in", manager.check_in, name, address, cin, cout, None, rno)
+            timed("set_room", manager.set_room, folio.fno, choice)
+            for item, quantity in orders:
+                timed("add_food", manager.add_food, folio.fno, item, quantity)
+    for folio in sorted(manager.folios.values(), key=lambda f: (f.coutdate, f.fno)):
+        depart(folio)
+    manager.close_day()
+    return out
+
+
+def run(guests, seed=1, profile=False):
+    """Benchmark a workload and return a dict of results
+
+    The hotel's profiler is on during the run only if profile is true.
+    """
+    workload = Workload(guests, seed)
+    timings = {"allocate": [], "check_in": [], "set_room": [], "add_food": [],
+               "invoice": [], "check_out": []}
+
+    was_enabled = hotel.PROFILER.enabled
+    hotel.PROFILER.enabled = profile
+    try:
+        manager = hotel.HotelManager()
+        start = time.perf_counter()
+        out = drive(workload, manager, timings)
+        elapsed = time.perf_counter() - start
+
+        # separate pass for memory, tracemalloc would distort the timings
+        tracemalloc.start()
+        drive(workload, hotel.HotelManager())
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    finally:
+        hotel.PROFILER.enabled = was_enabled
+
+    ops = {}
+    for name, samples in timings.items():
+        samples.sort()
+        ops[name] = {"count": len(samples),
+                     "p50": percentile(samples, 50),
+                     "p95": percentile(samples, 95),
+                     "p99": percentile(samples, 99),
+                     "max": samples[-1] if samples else 0}
+    total_ops = sum(op["count"] for op in ops.values())
+    return {"guests": guests, "checked_in": len(timings["check_in"]),
+            "profiler": profile, "seconds": elapsed,
+            "guests_per_second": guests / elapsed,
+            "ops_per_second": total_ops / elapsed,
+            "peak_memory": peak, "invoice_chars": out.chars, "ops": ops,
+            "room_nights": manager.report.totals(date(2026, 1, 1), date(2026, 12, 31))[0]}
+
+
+def display(results):
+    print ("******HOTEL BENCHMARK******")
+    print ("Guests:", results["guests"], "(%d checked in)" % results["checked_in"])
+    print ("Room nights:", results["room_nights"])
+    print ("Invoice text: %.1f MB" % (results["invoice_chars"] / 2 ** 20))
+    print ("Profiler:", "on" if results["profiler"] else "off")
+    print ("Elapsed: %.3f s" % results["seconds"])
+    print ("Throughput: %.0f guests/s, %.0f ops/s" % (results["guests_per_second"],
+                                                     results["ops_per_second"]))
+    print ("Peak memory: %.1f MB" % (results["peak_memory"] / 2 ** 20))
+    print ("%-10s %9s %9s %9s %9s %9s" % ("operation", "count", "p50 us", "p95 us", "p99 us", "max us"))
+    for name, op in results["ops"].items():
+        print ("%-10s %9d %9.1f %9.1f %9.1f %9.1f" % (name, op["count"], op["p50"] * 1e6,
+                                                      op["p95"] * 1e6, op["p99"] * 1e6,
+                                                      op["max"] * 1e6))
+
+
+def main():
+    guests = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    seed = int(sys.argv[2]) if len(sys.argv) > 2 else 1
+    display(run(guests, seed, os.environ.get("HOTEL_PROFILE") == "1"))
+
+
+if __name__ == "__main__":
+    main()
@@ -4,6 +4,10 @@ import os
 from datetime import datetime
 import hashlib
 import random
+import sys
+import time
+import zlib
+from concurrent.futures import ProcessPoolExecutor
 
 class Student:
     """Student data model class"""
@@ -57,48 +61,614 @@ class Student:
         return f"Student(ID: {self.student_id}, Name: {self.first_name} {self.last_name}, Username: {self.username})"
 
 
+def load_json_file(filename):
+    """Load one JSON file, returning an empty dict if it does not exist"""
+    if not os.path.exists(filename):
+        return {}
+    with open(filename, 'r') as file:
+        return json.load(file)
+
+
+def truncate_torn_tail(filename):
+    """Cut a partially written last line off an append-only file
+
+    Records appended after a crash would otherwise be glued onto the
+    torn line and lost with it.
+    """
+    if not os.path.exists(filename):
+        return
+    with open(filename, 'rb+') as file:
+        file.seek(0, os.SEEK_END)
+        end = file.tell()
+        if end == 0:
+            return
+        file.seek(end - 1)
+        if file.read(1) == b"\n":
+            return
+        chunk = 4096
+        while True:
+            start = max(0, end - chunk)
+            file.seek(start)
+            cut = file.read(end - start).rfind(b"\n")
+            if cut >= 0:
+                file.truncate(start + cut + 1)
+                return
+            if start == 0:
+                file.truncate(0)
+                return
+            chunk *= 2
+
+
+def normalize_email(email):
+    """Normalize an email address for duplicate checks"""
+    return email.strip().lower()
+
+
+def normalize_phone(phone):
+    """Normalize a phone number to its last 10 digits for duplicate checks"""
+    return re.sub(r'\D', '', phone)[-10:]
+
+
+def normalize_name(name):
+    """Normalize a name for duplicate checks"""
+    return " ".join(name.lower().split())
+
+
+def last_feed_seq(filename):
+    """Return the sequence number of the last complete record in a change feed"""
+    if not os.path.exists(filename):
+        return 0
+    with open(filename, 'rb') as file:
+        file.seek(0, os.SEEK_END)
+        end = file.tell()
+        chunk = 4096
+        while True:
+            start = max(0, end - chunk)
+            file.seek(start)
+            lines = file.read(end - start).split(b"\n")
+            # lines[-1] is empty or a partially written record
+            for line in reversed(lines[1:-1] if start else lines[:-1]):
+                try:
+                    return json.loads(line)['seq']
+                except ValueError:
+                    continue
+            if start == 0:
+                return 0
+            chunk *= 2
+
+
 class StudentDatabase:
     """Database operations class for managing student data"""
 
-    def __init__(self, filename="students.json"):
+    # Fields with a secondary index, mapped to the function that normalizes
+    # their values into index keys: field -> {key: set of usernames}
+    INDEXED_FIELDS = {
+        'student_id': str,
+        'email': normalize_email,
+        'phone_number': normalize_phone,
+    }
+
+    # Fields that may not be shared by two students when unique_contacts is on
+    UNIQUE_FIELDS = {'email': "Email", 'phone_number': "Phone number"}
+
+    # Field patches are appended to a change log and folded into the file
+    # they patch once this many have accumulated in that log
+    MAX_LOG_ENTRIES = 1000
+
+    # Students in this semester or later are moved to the archive
+    ARCHIVE_SEMESTER = 8
+
+    def __init__(self, filename="students.json", shards=0, feed=True, unique_contacts=True):
+        """Open the database
+
+        With shards > 0 students are split by a hash of their username
+        across that many files (students.0.json, students.1.json, ...),
+        which are loaded in parallel, and only the shard holding a changed
+        student is rewritten. The shard count is recorded in
+        students.json.shards and opening with a different count raises
+        ValueError.
+
+        With feed=True every change is also appended to the change feed
+        file (students.json.feed) for StudentReplica to follow.
+
+        With unique_contacts=True an email or phone number already used
+        by another student is rejected.
+
+        Students moved out by archive_students() live in a compressed
+        archive (students.json.archive.<generation> plus a
+        students.json.archive.idx index naming the current generation).
+        Lookups fall through to it and bring the student back into the
+        database.
+        """
         self.filename = filename
+        self.log_filename = filename + ".log"
+        self.feed_filename = filename + ".feed" if feed else None
+        self.feed_seq = 0
+        self.unique_contacts = unique_contacts
+        self.log_entries = {}  # change log file -> patches it holds
+        self.shards = shards
+        self.shards_filename = filename + ".shards"
+        self.check_shard_count()
+        self.shard_members = [set() for _ in range(shards)]
         self.students = {}
+        self.indexes = {field: {} for field in self.INDEXED_FIELDS}
+        self.archive_filename = filename + ".archive"
+        self.archive_index_filename = filename + ".archive.idx"
+        self.archive_generation = 0
+        self.archive_index = {}  # username -> [offset, length, index keys]
+        self.archive_indexes = {field: {} for field in self.INDEXED_FIELDS}
+        self.archive_indexes['name_dob'] = {}
         self.load_students()
+        self.load_archive()
+        if self.feed_filename:
+            self.open_feed()
+
+    def shard_filename(self, shard):
+        """Return the file name of a shard"""
+        base, ext = os.path.splitext(self.filename)
+        return f"{base}.{shard}{ext}"
+
+    def check_shard_count(self):
+        """Refuse to open the database with a different shard count than it was saved with"""
+        if not os.path.exists(self.shards_filename):
+            return
+        saved = load_json_file(self.shards_filename)['shards']
+        if saved != self.shards:
+            raise ValueError(f"Database {self.filename} has {saved} shards, "
+                             f"cannot open it with {self.shards}")
+
+    def record_shard_count(self):
+        """Save the shard count next to the shard files"""
+        with open(self.shards_filename, 'w') as file:
+            json.dump({'shards': self.shards}, file)
+
+    def shard_of(self, username):
+        """Return the shard a username belongs to"""
+        return zlib.crc32(username.encode()) % self.shards
 
     def load_students(self):
-        """Load students from JSON file"""
+        """Load students from JSON file and replay the change log"""
         try:
-            if os.path.exists(self.filename):
-                with open(self.filename, 'r') as file:
-                    data = json.load(file)
-                    for username, student_data in data.items():
-                        self.students[username] = Student.from_dict(student_data)
+            if self.shards:
+                data = self.load_shards()
+            elif os.path.exists(self.filename):
+                data = load_json_file(self.filename)
+            else:
+                data = None
+
+            if data is not None:
+                for username, student_data in data.items():
+                    self.students[username] = Student.from_dict(student_data)
+                    if self.shards:
+                        self.shard_members[self.shard_of(username)].add(username)
+                self.replay_log()
                 print(f"✓ Loaded {len(self.students)} students from database")
             else:
                 print("✓ Starting with empty database")
         except Exception as e:
             print(f"Error loading students: {e}")
             self.students = {}
+            self.shard_members = [set() for _ in range(self.shards)]
+        self.rebuild_indexes()
+
+    def load_shards(self):
+        """Load all shard files in parallel and merge them
+
+        If no shard exists yet but the unsharded file does, it is loaded
+        instead and split into shards. Returns None for a new database.
+        """
+        if not os.path.exists(self.shards_filename):
+            self.record_shard_count()
+
+        filenames = [self.shard_filename(i) for i in range(self.shards)]
+        if not any(os.path.exists(name) for name in filenames):
+            if not os.path.exists(self.filename):
+                return None
+            data = load_json_file(self.filename)
+            self.students = {username: Student.from_dict(d) for username, d in data.items()}
+            # Patches logged against the unsharded file go into the shards too
+            self.replay_log([self.log_filename])
+            for username in self.students:
+                self.shard_members[self.shard_of(username)].add(username)
+            if not self.save_students():
+                raise OSError("could not split the database into shards")
+            self.remove_log(self.log_filename)
+            data = {username: student.to_dict() for username, student in self.students.items()}
+            self.students = {}
+            self.shard_members = [set() for _ in range(self.shards)]
+            return data
 
-    def save_students(self):
-        """Save students to JSON file"""
         try:
-            data = {}
-            for username, student in self.students.items():
-                data[username] = student.to_dict()
+            with ProcessPoolExecutor(max_workers=min(self.shards, os.cpu_count() or 1)) as pool:
+                parts = list(pool.map(load_json_file, filenames))
+        except Exception:
+            # No usable process pool here, load one shard after another
+            parts = [load_json_file(name) for name in filenames]
+
+        data = {}
+        for part in parts:
+            data.update(part)
+        return data
+
+    def log_filename_for(self, username):
+        """Return the change log holding a student's patches
+
+        Each shard has its own log, removed whenever the shard is
+        rewritten, so a log never outlives the file it patches.
+        """
+        if self.shards:
+            return self.shard_filename(self.shard_of(username)) + ".log"
+        return self.log_filename
+
+    def replay_log(self, filenames=None):
+        """Apply field patches saved since their file was last written"""
+        if filenames is None:
+            if self.shards:
+                filenames = [self.shard_filename(i) + ".log" for i in range(self.shards)]
+            else:
+                filenames = [self.log_filename]
+        for filename in filenames:
+            if not os.path.exists(filename):
+                continue
+            truncate_torn_tail(filename)
+            with open(filename, 'r') as file:
+                for line in file:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue
+                    student = self.students.get(entry['username'])
+                    if student is not None:
+                        for field, value in entry['changes'].items():
+                            setattr(student, field, value)
+                    self.log_entries[filename] = self.log_entries.get(filename, 0) + 1
+
+    def rebuild_indexes(self):
+        """Rebuild all secondary indexes from the loaded students"""
+        for index in self.indexes.values():
+            index.clear()
+        for student in self.students.values():
+            self.index_student(student)
+
+    def index_key(self, field, value):
+        """Return the normalized index key for a field value"""
+        return self.INDEXED_FIELDS[field](value)
+
+    def index_student(self, student):
+        """Add a student to the secondary indexes"""
+        for field in self.indexes:
+            self.index_field(student.username, field, getattr(student, field))
+
+    def index_field(self, username, field, value):
+        """Add one username/value pair to a field's index"""
+        key = self.index_key(field, value)
+        if key:
+            self.indexes[field].setdefault(key, set()).add(username)
+
+    def unindex_field(self, username, field, value):
+        """Remove one username/value pair from a field's index"""
+        key = self.index_key(field, value)
+        usernames = self.indexes[field].get(key)
+        if usernames is not None:
+            usernames.discard(username)
+            if not usernames:
+                del self.indexes[field][key]
+
+    def contact_in_use(self, field, value, username=None):
+        """Check if another student already uses this email or phone number"""
+        key = self.index_key(field, value)
+        for indexes in (self.indexes, self.archive_indexes):
+            usernames = indexes[field].get(key, ())
+            if any(other != username for other in usernames):
+                return True
+        return False
+
+    def check_unique(self, username, values):
+        """Return an error message if any unique field value is taken, else None"""
+        if not self.unique_contacts:
+            return None
+        for field, label in self.UNIQUE_FIELDS.items():
+            if field in values and self.contact_in_use(field, values[field], username):
+                return f"{label} already registered!"
+        return None
 
-            with open(self.filename, 'w') as file:
-                json.dump(data, file, indent=4)
+    @staticmethod
+    def name_dob_key(student):
+        """Return the full name plus date of birth blocking key, or ''"""
+        name = normalize_name(f"{student.first_name} {student.last_name}")
+        if name and student.date_of_birth:
+            return f"{name}|{student.date_of_birth}"
+        return ''
+
+    def find_duplicates(self):
+        """Return clusters of usernames that are likely the same person
+
+        Students are linked when they share a normalized email, phone
+        number, or full name plus date of birth. One pass groups students
+        by those blocking keys and a union-find merges the groups, so no
+        pairwise comparison is needed. Archived students are included
+        through the keys kept in the archive index. Clusters are sorted
+        lists of usernames, largest first.
+        """
+        parent = {}
+
+        def find(username):
+            root = username
+            while parent.get(root, root) != root:
+                root = parent[root]
+            while username != root:
+                parent[username], username = root, parent[username]
+            return root
+
+        def union(usernames):
+            for username in usernames:
+                parent.setdefault(username, username)
+            usernames = iter(usernames)
+            root = find(next(usernames))
+            for other in usernames:
+                other_root = find(other)
+                if other_root != root:
+                    parent[other_root] = root
+
+        blocks = {key: list(usernames) for key, usernames
+                  in self.archive_indexes['name_dob'].items()}
+        for username, student in self.students.items():
+            key = self.name_dob_key(student)
+            if key:
+                blocks.setdefault(key, []).append(username)
+
+        for group in blocks.values():
+            if len(group) > 1:
+                union(group)
+        for field in self.UNIQUE_FIELDS:
+            hot, archived = self.indexes[field], self.archive_indexes[field]
+            for key in hot.keys() | archived.keys():
+                group = list(hot.get(key, ())) + list(archived.get(key, ()))
+                if len(group) > 1:
+                    union(group)
+
+        clusters = {}
+        for username in parent:
+            clusters.setdefault(find(username), []).append(username)
+        return sorted((sorted(c) for c in clusters.values()), key=lambda c: (-len(c), c))
+
+    def save_students(self, shard=None):
+        """Save students to JSON file, or to a single shard file"""
+        try:
+            if self.shards and shard is not None:
+                self.write_shard(shard)
+                return True
+
+            if self.shards:
+                for i in range(self.shards):
+                    self.write_shard(i)
+            else:
+                data = {}
+                for username, student in self.students.items():
+                    data[username] = student.to_dict()
+
+                with open(self.filename, 'w') as file:
+                    json.dump(data, file, indent=4)
+
+                # The full file now includes every logged patch
+                self.remove_log(self.log_filename)
             return True
         except Exception as e:
             print(f"Error saving students: {e}")
             return False
 
+    def write_shard(self, shard):
+        """Rewrite one shard file from the students it holds"""
+        data = {}
+        for username in self.shard_members[shard]:
+            data[username] = self.students[username].to_dict()
+        with open(self.shard_filename(shard), 'w') as file:
+            json.dump(data, file, indent=4)
+        self.remove_log(self.shard_filename(shard) + ".log")
+
+    def remove_log(self, filename):
+        """Drop a change log whose patches are now in the saved file"""
+        if os.path.exists(filename):
+            os.remove(filename)
+        self.log_entries.pop(filename, None)
+
+    def save_student(self, username):
+        """Save the file holding one student: its shard, or the whole database"""
+        if self.shards:
+            return self.save_students(self.shard_of(username))
+        return self.save_students()
+
+    def append_log(self, username, changes):
+        """Persist a field patch by appending it to the change log"""
+        filename = self.log_filename_for(username)
+        try:
+            with open(filename, 'a') as file:
+                file.write(json.dumps({'username': username, 'changes': changes}) + "\n")
+            self.log_entries[filename] = self.log_entries.get(filename, 0) + 1
+            if self.log_entries[filename] >= self.MAX_LOG_ENTRIES:
+                return self.save_student(username)
+            return True
+        except Exception as e:
+            print(f"Error saving changes: {e}")
+            return False
+
+    def open_feed(self):
+        """Continue the change feed, seeding a new feed with every current student"""
+        if os.path.exists(self.feed_filename):
+            truncate_torn_tail(self.feed_filename)
+            self.feed_seq = last_feed_seq(self.feed_filename)
+            return
+        try:
+            now = time.time()
+            lines = []
+            for username, student in self.students.items():
+                self.feed_seq += 1
+                lines.append(json.dumps({'seq': self.feed_seq, 'time': now, 'op': 'put',
+                                         'username': username, 'data': student.to_dict()}) + "\n")
+            with open(self.feed_filename, 'a') as file:
+                file.write("".join(lines))
+        except Exception as e:
+            print(f"Error writing change feed: {e}")
+
+    def emit_change(self, op, username, data):
+        """Append a sequence-numbered record to the change feed
+
+        op is 'put' with the full student record, or 'patch' with only
+        the changed fields.
+        """
+        if not self.feed_filename:
+            return
+        try:
+            self.feed_seq += 1
+            record = {'seq': self.feed_seq, 'time': time.time(), 'op': op,
+                      'username': username, 'data': data}
+            with open(self.feed_filename, 'a') as file:
+                file.write(json.dumps(record) + "\n")
+        except Exception as e:
+            print(f"Error writing change feed: {e}")
+
+    def archive_data_filename(self, generation):
+        """Return the archive data file of a generation"""
+        return f"{self.archive_filename}.{generation}"
+
+    def load_archive(self):
+        """Load the archive index, skipping students that are back in the database"""
+        try:
+            data = load_json_file(self.archive_index_filename)
+            self.archive_generation = data.get('generation', 0)
+            self.archive_index = {username: entry for username, entry
+                                  in data.get('students', {}).items()
+                                  if username not in self.students}
+        except Exception as e:
+            print(f"Error loading archive index: {e}")
+            self.archive_index = {}
+        for index in self.archive_indexes.values():
+            index.clear()
+        for username, (_, _, keys) in self.archive_index.items():
+            for field, key in keys.items():
+                if key:
+                    self.archive_indexes[field].setdefault(key, set()).add(username)
+
+    def is_inactive(self, student):
+        """Check if a student has reached ARCHIVE_SEMESTER"""
+        return student.semester.isdigit() and int(student.semester) >= self.ARCHIVE_SEMESTER
+
+    def archive_students(self, is_inactive=None):
+        """Move inactive students into the compressed archive
+
+        Each student is stored as a separately zlib-compressed JSON record
+        so it can be read back on its own. The still-archived records plus
+        the new ones are written to the next generation's data file, and
+        replacing the index (which names that generation) switches over
+        in one step, so the index never points into the wrong data file.
+        The database is then saved without the archived students.
+        Returns the number of students archived.
+        """
+        if is_inactive is None:
+            is_inactive = self.is_inactive
+        moving = [username for username, student in self.students.items() if is_inactive(student)]
+        if not moving:
+            return 0
+
+        old_filename = self.archive_data_filename(self.archive_generation)
+        generation = self.archive_generation + 1
+        try:
+            new_index = {}
+            with open(self.archive_data_filename(generation), 'wb') as out:
+                if os.path.exists(old_filename):
+                    with open(old_filename, 'rb') as old:
+                        for username, (offset, length, keys) in self.archive_index.items():
+                            old.seek(offset)
+                            new_index[username] = [out.tell(), length, keys]
+                            out.write(old.read(length))
+                for username in moving:
+                    student = self.students[username]
+                    record = zlib.compress(json.dumps(student.to_dict()).encode())
+                    keys = {field: self.index_key(field, getattr(student, field))
+                            for field in self.indexes}
+                    keys['name_dob'] = self.name_dob_key(student)
+                    new_index[username] = [out.tell(), len(record), keys]
+                    out.write(record)
+            with open(self.archive_index_filename + ".tmp", 'w') as file:
+                json.dump({'generation': generation, 'students': new_index}, file)
+            os.replace(self.archive_index_filename + ".tmp", self.archive_index_filename)
+        except Exception as e:
+            print(f"Error writing archive: {e}")
+            return 0
+
+        if os.path.exists(old_filename):
+            os.remove(old_filename)
+        self.archive_generation = generation
+        self.archive_index = new_index
+        for username in moving:
+            student = self.students.pop(username)
+            if self.shards:
+                self.shard_members[self.shard_of(username)].discard(username)
+            for field, key in new_index[username][2].items():
+                if field in self.indexes:
+                    self.unindex_field(username, field, getattr(student, field))
+                if key:
+                    self.archive_indexes[field].setdefault(key, set()).add(username)
+        self.save_students()
+        return len(moving)
+
+    def read_archived(self, username):
+        """Read an archived student without promoting it, returning it or None"""
+        entry = self.archive_index.get(username)
+        if entry is None:
+            return None
+        offset, length, _ = entry
+        try:
+            with open(self.archive_data_filename(self.archive_generation), 'rb') as file:
+                file.seek(offset)
+                return Student.from_dict(json.loads(zlib.decompress(file.read(length))))
+        except Exception as e:
+            print(f"Error reading archive: {e}")
+            return None
+
+    def promote_student(self, username, student=None):
+        """Bring an archived student back into the database, returning it or None
+
+        student may be the record already read by read_archived().
+        """
+        if student is None:
+            student = self.read_archived(username)
+            if student is None:
+                return None
+        keys = self.archive_index[username][2]
+
+        # The archive files are left alone: once the student is saved in
+        # the database, load_archive() ignores their archived copy
+        del self.archive_index[username]
+        for field, key in keys.items():
+            usernames = self.archive_indexes[field].get(key)
+            if usernames is not None:
+                usernames.discard(username)
+                if not usernames:
+                    del self.archive_indexes[field][key]
+        self.students[username] = student
+        if self.shards:
+            self.shard_members[self.shard_of(username)].add(username)
+        self.index_student(student)
+        self.save_student(username)
+        return student
+
+    def get_student(self, username):
+        """Return a student by username, promoting it from the archive if needed"""
+        student = self.students.get(username)
+        if student is None:
+            student = self.promote_student(username)
+        return student
+
     def register_student(self, student):
         """Register a new student"""
-        if student.username in self.students:
+        if self.username_exists(student.username):
             return False, "Username already exists!"
 
+        error = self.check_unique(student.username, student.to_dict())
+        if error:
+            return False, error
+
         # Generate unique student ID
         student.student_id = self.generate_student_id()
 
@@ -106,45 +676,109 @@ class StudentDatabase:
         student.password = self.hash_password(student.password)
 
         self.students[student.username] = student
-        if self.save_students():
+        if self.shards:
+            self.shard_members[self.shard_of(student.username)].add(student.username)
+        self.index_student(student)
+        if self.save_student(student.username):
+            self.emit_change('put', student.username, student.to_dict())
             return True, "Registration successful!"
         else:
             return False, "Failed to save student data!"
 
     def authenticate_student(self, username, password):
-        """Authenticate student login"""
-        if username in self.students:
-            stored_password = self.students[username].password
-            if self.verify_password(password, stored_password):
-                return self.students[username]
+        """Authenticate student login
+
+        An archived student is only promoted back once the password matches.
+        """
+        student = self.students.get(username)
+        if student is not None:
+            if self.verify_password(password, student.password):
+                return student
+            return None
+
+        student = self.read_archived(username)
+        if student is not None and self.verify_password(password, student.password):
+            return self.promote_student(username, student)
         return None
 
     def update_student(self, username, updated_student):
         """Update student profile"""
-        if username in self.students:
+        stored = self.get_student(username)
+        if stored is not None:
+            # Only contacts that change are checked, so a student already
+            # sharing one (unique_contacts off, or legacy data) can still
+            # edit the rest of their profile
+            changed = {field: getattr(updated_student, field) for field in self.UNIQUE_FIELDS
+                       if self.index_key(field, getattr(updated_student, field))
+                       != self.index_key(field, getattr(stored, field))}
+            error = self.check_unique(username, changed)
+            if error:
+                return False, error
+
             # Keep the original password and student_id
             updated_student.password = self.students[username].password
             updated_student.student_id = self.students[username].student_id
             updated_student.username = username
 
+            for field in self.indexes:
+                self.unindex_field(username, field, getattr(self.students[username], field))
             self.students[username] = updated_student
-            if self.save_students():
+            self.index_student(updated_student)
+            if self.save_student(username):
+                self.emit_change('put', username, updated_student.to_dict())
                 return True, "Profile updated successfully!"
             else:
                 return False, "Failed to save updated profile!"
         return False, "Student not found!"
 
+    def patch_student(self, username, changes):
+        """Validate and apply only the given fields of a student profile
+
+        changes maps field names to new values. All values are validated
+        before anything is applied; fields whose value is unchanged are
+        skipped. Only the changed fields are written, to the change log.
+        """
+        student = self.get_student(username)
+        if student is None:
+            return False, "Student not found!"
+
+        delta = {}
+        for field, value in changes.items():
+            is_valid, result = InputValidator.validate_field(field, value)
+            if not is_valid:
+                return False, result
+            if getattr(student, field) != result:
+                delta[field] = result
+
+        if not delta:
+            return True, "No changes to save."
+
+        error = self.check_unique(username, delta)
+        if error:
+            return False, error
+
+        for field, value in delta.items():
+            if field in self.indexes:
+                self.unindex_field(username, field, getattr(student, field))
+                self.index_field(username, field, value)
+            setattr(student, field, value)
+
+        if self.append_log(username, delta):
+            self.emit_change('patch', username, delta)
+            return True, "Profile updated successfully!"
+        return False, "Failed to save updated profile!"
+
     def username_exists(self, username):
         """Check if username exists"""
-        return username in self.students
+        return username in self.students or username in self.archive_index
 
     def generate_student_id(self):
         """Generate unique student ID"""
         while True:
             student_id = f"STU{random.randint(100000, 999999)}"
             # Check if ID already exists
-            exists = any(student.student_id == student_id for student in self.students.values())
-            if not exists:
+            if (student_id not in self.indexes['student_id']
+                    and student_id not in self.archive_indexes['student_id']):
                 return student_id
 
     def hash_password(self, password):
@@ -156,6 +790,99 @@ class StudentDatabase:
         return self.hash_password(password) == hashed_password
 
 
+class StudentReplica:
+    """Read-only copy of the students, kept up to date from a change feed
+
+    The replica never opens the primary's database files. It tails the
+    feed file written by StudentDatabase and applies new records in
+    sequence order each time poll() is called. Unreadable lines and
+    missing sequence numbers are counted and reported by lag() rather
+    than skipped silently.
+    """
+
+    def __init__(self, feed_filename="students.json.feed"):
+        self.feed_filename = feed_filename
+        self.students = {}
+        self.offset = 0          # bytes of the feed applied so far
+        self.seq = 0             # sequence number of the last applied record
+        self.last_change = None  # write time of the last applied record
+        self.last_delay = 0.0    # seconds between that write and applying it
+        self.unreadable = 0      # complete feed lines that were not valid records
+        self.gaps = []           # (first, last) runs of sequence numbers never seen
+        self.poll()
+
+    def poll(self):
+        """Apply any new feed records, returning how many were applied"""
+        if not os.path.exists(self.feed_filename):
+            return 0
+        applied = 0
+        with open(self.feed_filename, 'rb') as file:
+            file.seek(self.offset)
+            for line in file:
+                if not line.endswith(b"\n"):
+                    break  # record still being written
+                self.offset += len(line)
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    self.unreadable += 1  # damaged by a crash of the primary
+                    continue
+                if record['seq'] <= self.seq:
+                    continue
+                if record['seq'] > self.seq + 1:
+                    self.gaps.append((self.seq + 1, record['seq'] - 1))
+                if record['op'] == 'put':
+                    self.students[record['username']] = Student.from_dict(record['data'])
+                elif record['username'] in self.students:
+                    student = self.students[record['username']]
+                    for field, value in record['data'].items():
+                        setattr(student, field, value)
+                self.seq = record['seq']
+                self.last_change = record['time']
+                applied += 1
+        if applied:
+            self.last_delay = time.time() - self.last_change
+        return applied
+
+    def lag(self):
+        """Return replication lag: unread feed bytes, apply delay in seconds and lost records
+
+        missing counts sequence numbers that never reached the replica,
+        listed as (first, last) runs in gaps.
+        """
+        try:
+            pending = os.path.getsize(self.feed_filename) - self.offset
+        except OSError:
+            pending = 0
+        missing = sum(last - first + 1 for first, last in self.gaps)
+        return {'seq': self.seq, 'pending_bytes': pending, 'seconds': self.last_delay,
+                'missing': missing, 'gaps': list(self.gaps), 'unreadable': self.unreadable}
+
+    def get_student(self, username):
+        """Return a student by username, or None"""
+        return self.students.get(username)
+
+    def username_exists(self, username):
+        """Check if username exists"""
+        return username in self.students
+
+    def follow(self, interval=1.0):
+        """Keep polling the feed and print the replica status until interrupted"""
+        try:
+            while True:
+                applied = self.poll()
+                lag = self.lag()
+                print(f"✓ Replica at seq {lag['seq']}: {len(self.students)} students, "
+                      f"{applied} applied, {lag['pending_bytes']} bytes behind, "
+                      f"lag {lag['seconds']:.3f}s")
+                if lag['missing'] or lag['unreadable']:
+                    print(f"✗ Replica is missing {lag['missing']} records {lag['gaps']} "
+                          f"and skipped {lag['unreadable']} unreadable lines")
+                time.sleep(interval)
+        except KeyboardInterrupt:
+            print("\n✓ Replica stopped.")
+
+
 class InputValidator:
     """Input validation class for all user inputs"""
 
@@ -269,6 +996,37 @@ class InputValidator:
             return False, "Course name should be at least 2 characters long"
         return True, course
 
+    @staticmethod
+    def validate_address(address):
+        """Validate address"""
+        if not address or not address.strip():
+            return False, "Address cannot be empty"
+        return True, address.strip()
+
+    @staticmethod
+    def validate_field(field, value):
+        """Validate a value for a named Student field"""
+        validators = {
+            'first_name': (InputValidator.validate_name, "First Name"),
+            'last_name': (InputValidator.validate_name, "Last Name"),
+            'email': (InputValidator.validate_email,),
+            'phone_number': (InputValidator.validate_phone,),
+            'address': (InputValidator.validate_address,),
+            'date_of_birth': (InputValidator.validate_date,),
+            'gender': (InputValidator.validate_gender,),
+            'course': (InputValidator.validate_course,),
+            'semester': (InputValidator.validate_semester,),
+            'father_name': (InputValidator.validate_name, "Father's Name"),
+            'mother_name': (InputValidator.validate_name, "Mother's Name"),
+            'emergency_contact': (InputValidator.validate_phone,),
+        }
+        if field not in validators:
+            return False, f"{field} cannot be updated"
+        if not isinstance(value, str):
+            return False, f"{field} should be text"
+        validator, *args = validators[field]
+        return validator(value, *args)
+
 
 class StudentSystem:
     """Main application class with user interface"""
@@ -278,6 +1036,11 @@ class StudentSystem:
         self.current_student = None
         self.validator = InputValidator()
 
+        # Keep graduated students out of the hot database
+        archived = self.db.archive_students()
+        if archived:
+            print(f"✓ Archived {archived} inactive students")
+
     def run(self):
         """Main application loop"""
         print("=" * 50)
@@ -361,8 +1124,17 @@ class StudentSystem:
                 print("✗ Username already exists! Please choose another.")
 
             password = self.get_validated_input("Password: ", self.validator.validate_password)
-            email = self.get_validated_input("Email: ", self.validator.validate_email)
-            phone_number = self.get_validated_input("Phone Number: ", self.validator.validate_phone)
+            while True:
+                email = self.get_validated_input("Email: ", self.validator.validate_email)
+                if not (self.db.unique_contacts and self.db.contact_in_use('email', email)):
+                    break
+                print("✗ Email already registered! Please use another.")
+
+            while True:
+                phone_number = self.get_validated_input("Phone Number: ", self.validator.validate_phone)
+                if not (self.db.unique_contacts and self.db.contact_in_use('phone_number', phone_number)):
+                    break
+                print("✗ Phone number already registered! Please use another.")
 
             print("Address: ", end="")
             address = input().strip()
@@ -468,64 +1240,52 @@ class StudentSystem:
 
         try:
             s = self.current_student
-            updated_student = Student()
-
-            # Copy current values
-            updated_student.first_name = s.first_name
-            updated_student.last_name = s.last_name
-            updated_student.email = s.email
-            updated_student.phone_number = s.phone_number
-            updated_student.address = s.address
-            updated_student.course = s.course
-            updated_student.semester = s.semester
-            updated_student.emergency_contact = s.emergency_contact
-
-            # Update fields
+            changes = {}
+
             new_value = self.get_optional_input(f"First Name ({s.first_name}): ", 
                                               self.validator.validate_name, "First Name")
             if new_value:
-                updated_student.first_name = new_value
+                changes['first_name'] = new_value
 
             new_value = self.get_optional_input(f"Last Name ({s.last_name}): ", 
                                               self.validator.validate_name, "Last Name")
             if new_value:
-                updated_student.last_name = new_value
+                changes['last_name'] = new_value
 
             new_value = self.get_optional_input(f"Email ({s.email}): ", 
                                               self.validator.validate_email)
             if new_value:
-                updated_student.email = new_value
+                changes['email'] = new_value
 
             new_value = self.get_optional_input(f"Phone ({s.phone_number}): ", 
                                               self.validator.validate_phone)
             if new_value:
-                updated_student.phone_number = new_value
+                changes['phone_number'] = new_value
 
             print(f"Address ({s.address}): ", end="")
             new_address = input().strip()
             if new_address:
-                updated_student.address = new_address
+                changes['address'] = new_address
 
             new_value = self.get_optional_input(f"Course ({s.course}): ", 
                                               self.validator.validate_course)
             if new_value:
-                updated_student.course = new_value
+                changes['course'] = new_value
 
             new_value = self.get_optional_input(f"Semester ({s.semester}): ", 
                                               self.validator.validate_semester)
             if new_value:
-                updated_student.semester = new_value
+                changes['semester'] = new_value
 
             new_value = self.get_optional_input(f"Emergency Contact ({s.emergency_contact}): ", 
                                               self.validator.validate_phone)
             if new_value:
-                updated_student.emergency_contact = new_value
+                changes['emergency_contact'] = new_value
 
-            # Update in database
-            success, message = self.db.update_student(s.username, updated_student)
+            # Update only the changed fields in the database
+            success, message = self.db.patch_student(s.username, changes)
 
             if success:
-                self.current_student = updated_student
                 print(f"\n✓ {message}")
             else:
                 print(f"\n✗ Update failed: {message}")
@@ -609,8 +1369,20 @@ class StudentSystem:
 
 
 def main():
-    """Main function to run the Student Management System"""
+    """Main function to run the Student Management System
+
+    Inactive students (semester 8 and later) are moved to the archive
+    every time the system starts. Run with --archive to only do that and
+    exit, or with --replica to follow the change feed as a read replica.
+    """
     try:
+        if len(sys.argv) > 1 and sys.argv[1] == "--replica":
+            StudentReplica().follow()
+            return
+        if len(sys.argv) > 1 and sys.argv[1] == "--archive":
+            archived = StudentDatabase().archive_students()
+            print(f"✓ Archived {archived} inactive students")
+            return
         system = StudentSystem()
         system.run()
     except Exception as e: